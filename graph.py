@@ -1,21 +1,25 @@
-from typing import Dict, List, Set
+import sys
+from array import array
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from graph_kernels import bfs_parents, bidir_bfs, component_in_degrees, iter_bfs, path_based_scc
 
 class Edge: 
     """
-    Represents an edge in a graph.
+    Represents an edge in a graph. Two edges are equal if they join the same start and end vertices.
     
     Attributes:
         start_vertex (Vertex): The starting vertex of the edge.
         end_vertex (Vertex): The ending vertex of the edge.
         weight (int): The weight of the edge.
     """
+
+    __slots__ = ('start_vertex', 'end_vertex', 'weight')
     
     def __init__(self, start_vertex: 'Vertex', end_vertex: 'Vertex', weight: int = 1):
         self.start_vertex = start_vertex
         self.end_vertex = end_vertex
         self.weight = weight
-        start_vertex.add_outgoing_edge(self)
-        end_vertex.add_incoming_edge(self)
     
     def __str__(self) -> str:
         return f"{self.start_vertex} -> {self.end_vertex}"
@@ -23,6 +27,14 @@ class Edge:
     def __repr__(self) -> str:
         return self.__str__()
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Edge):
+            return NotImplemented
+        return self.start_vertex is other.start_vertex and self.end_vertex is other.end_vertex
+
+    def __hash__(self) -> int:
+        return hash((self.start_vertex, self.end_vertex))
+
 
 class Vertex:
     """
@@ -30,14 +42,19 @@ class Vertex:
     
     Attributes:
         label (str): The label of the vertex.
-        incoming_edges (Set['Edge']): A set of edges directed towards this vertex.
-        outgoing_edges (Set['Edge']): A set of edges directed away from this vertex.
+        index (int): The dense integer id of the vertex, assigned when it is added to a DirectedGraph.
+        in_neighbors (List['Vertex']): The vertices with an edge directed towards this vertex.
+        out_neighbors (List['Vertex']): The vertices this vertex has an edge directed towards.
     """
+
+    __slots__ = ('label', 'index', 'in_neighbors', 'out_neighbors', '_cached_neighbours')
     
     def __init__(self, label: str):
         self.label = label
-        self.incoming_edges: Set['Edge'] = set()
-        self.outgoing_edges: Set['Edge'] = set()
+        self.index = -1
+        self.in_neighbors: List['Vertex'] = []
+        self.out_neighbors: List['Vertex'] = []
+        self._cached_neighbours: Optional[FrozenSet['Vertex']] = None
 
     def __str__(self) -> str:
         return f"{self.label}"
@@ -45,29 +62,36 @@ class Vertex:
     def __repr__(self) -> str:
         return self.__str__()
 
-    def add_incoming_edge(self, edge: 'Edge') -> None:
+    def add_in_neighbor(self, vertex: 'Vertex') -> None:
         """
-        Adds an incoming edge to the vertex.
+        Adds a vertex with an edge towards this vertex. Duplicate edges are filtered out by DirectedGraph.add_edge.
         Args:
-            edge (Edge): The edge to be added.
+            vertex (Vertex): The starting vertex of the edge.
         """
-        self.incoming_edges.add(edge)
+        self.in_neighbors.append(vertex)
+        self._cached_neighbours = None
 
-    def add_outgoing_edge(self, edge: 'Edge') -> None:
+    def add_out_neighbor(self, vertex: 'Vertex') -> None:
         """
-        Adds an outgoing edge to the vertex.
+        Adds a vertex this vertex has an edge towards. Duplicate edges are filtered out by DirectedGraph.add_edge.
         Args:
-            edge (Edge): The edge to be added.
+            vertex (Vertex): The ending vertex of the edge.
         """
-        self.outgoing_edges.add(edge)
+        self.out_neighbors.append(vertex)
+        self._cached_neighbours = None
 
     def get_neighbours(self) -> Set['Vertex']:
         """
-        Get the set of neighboring vertices.
+        Get the set of neighboring vertices. The neighbours are cached until another edge is added to this
+        vertex, and each call returns a new set that the caller is free to modify.
         Returns:
             Set[Vertex]: A set of vertices that are connected to this vertex by an edge.
         """
-        return { edge.end_vertex for edge in self.outgoing_edges} | {edge.start_vertex for edge in self.incoming_edges}
+        if self._cached_neighbours is None:
+            neighbours = set(self.out_neighbors)
+            neighbours.update(self.in_neighbors)
+            self._cached_neighbours = frozenset(neighbours)
+        return set(self._cached_neighbours)
 
     def get_in_degree(self) -> int:
         """
@@ -75,7 +99,7 @@ class Vertex:
         Returns:
             int: The number of incoming edges.
         """
-        return len(self.incoming_edges)
+        return len(self.in_neighbors)
     
     def get_out_degree(self) -> int:
         """
@@ -83,7 +107,7 @@ class Vertex:
         Returns:
             int: The number of outgoing edges.
         """
-        return len(self.outgoing_edges)
+        return len(self.out_neighbors)
 
 class DirectedGraph:
     """
@@ -91,26 +115,58 @@ class DirectedGraph:
     
     Attributes:
         vertices (Dict[str, Vertex]): A list of vertices in the graph.
-        edges (Set[Edge]): A list of edges in the graph.
+        edges (List[Edge]): A list of edges in the graph, in insertion order.
     """
     def __init__(self):
         self.vertices: Dict[str, Vertex] = {}
-        self.edges: Set[Edge] = set()
+        self.edges: List[Edge] = []
+        self._edge_set: Set[Edge] = set()
+
+        # Vertices by integer index, and the compressed sparse row adjacency rebuilt by finalize().
+        self._order: List[Vertex] = []
+        self._finalized = False
+        self._out_indptr = array('i', [0])
+        self._out_indices = array('i')
+        self._in_indptr = array('i', [0])
+        self._in_indices = array('i')
+
+        # SCC results for the current CSR, computed on first use and dropped when finalize() rebuilds.
+        self._components: Optional[Tuple[array, int]] = None
+        self._source_components: Optional[List[Tuple[int, str]]] = None
 
     def __str__(self) -> str:
         return "\n".join([str(edge) for edge in self.edges])
     
     def add_vertex(self, label: str) -> None:
         """
-        Add a vertex if it doesn't exists.
+        Add a vertex if it doesn't exists. The label is interned so later lookups can compare by identity.
 
         Args:
             label (str): The label of the vertex.
         """
+        label = self._intern_label(label)
         if label not in self.vertices:
-            self.vertices[label] = Vertex(label)
+            vertex = Vertex(label)
+            vertex.index = len(self._order)
+            self.vertices[label] = vertex
+            self._order.append(vertex)
+            self._finalized = False
     
 
+    @staticmethod
+    def _intern_label(label: str) -> str:
+        """
+        Intern a label so dict lookups can compare by identity. sys.intern only accepts exact str,
+        so str subclasses and other hashable labels are returned unchanged.
+
+        Args:
+            label (str): The label of a vertex.
+
+        Returns:
+            str: The interned label, or the label itself if it cannot be interned.
+        """
+        return sys.intern(label) if type(label) is str else label
+
     def get_vertex(self, label: str) -> Vertex:
         """
         Get a Vertex by its label. If the vertex does not exist, create it.
@@ -121,14 +177,16 @@ class DirectedGraph:
         returns:
             Vertex: The vertex with the given label.
         """
-        if label not in self.vertices:
+        vertex = self.vertices.get(label)
+        if vertex is None:
             self.add_vertex(label)
+            vertex = self.vertices[label]
 
-        return self.vertices[label]
+        return vertex
     
     def add_edge(self, start: str, end: str) -> None:
         """
-        Add a directed edge from start to end.
+        Add a directed edge from start to end. Adding an edge that already exists does nothing.
 
         args:
             start_label (str): The label of the starting vertex of the edge.
@@ -136,11 +194,49 @@ class DirectedGraph:
         """
         start_vertex = self.get_vertex(start)
         end_vertex = self.get_vertex(end)
-        self.edges.add(Edge(start_vertex, end_vertex))
+        edge = Edge(start_vertex, end_vertex)
+        if edge in self._edge_set:
+            return
+
+        start_vertex.add_out_neighbor(end_vertex)
+        end_vertex.add_in_neighbor(start_vertex)
+        self._edge_set.add(edge)
+        self.edges.append(edge)
+        self._finalized = False
+
+    def finalize(self) -> None:
+        """
+        Build the compressed sparse row (CSR) adjacency used by the traversal algorithms.
+
+        The successors of the vertex with index i are out_indices[out_indptr[i]:out_indptr[i + 1]],
+        and its predecessors are stored the same way in the in_indptr/in_indices arrays. Each
+        vertex's neighbour lists already form its CSR row, so they are flattened in index order.
+        Nothing is rebuilt if the graph has not changed since the last call.
+        """
+        if self._finalized:
+            return
+
+        out_indptr = array('i', [0])
+        out_indices = array('i')
+        in_indptr = array('i', [0])
+        in_indices = array('i')
+        out_extend, out_append = out_indices.extend, out_indptr.append
+        in_extend, in_append = in_indices.extend, in_indptr.append
+        for vertex in self._order:
+            out_extend([neighbor.index for neighbor in vertex.out_neighbors])
+            out_append(len(out_indices))
+            in_extend([neighbor.index for neighbor in vertex.in_neighbors])
+            in_append(len(in_indices))
+
+        self._out_indptr, self._out_indices = out_indptr, out_indices
+        self._in_indptr, self._in_indices = in_indptr, in_indices
+        self._components = None
+        self._source_components = None
+        self._finalized = True
     
     def get_path(self, start_label: str, end_label: str) -> List[Vertex]:
         """
-        Get a path from start to end using Depth First Search.
+        Get a shortest path from start to end using bidirectional Breadth First Search.
         
         Args:
             start_label (str): The label of the starting vertex.
@@ -152,30 +248,52 @@ class DirectedGraph:
         if start_label not in self.vertices or end_label not in self.vertices:
             return []
         
-        def dfs(current: Vertex, end: Vertex, visited: Set[Vertex], path: List[Vertex]) -> bool:
-            # Base case - Return if the current vertex is the end vertex.
-            if current == end: return True
-                
-            visited.add(current)
-            path.append(current)
-            
-            for neighbor in current.outgoing_edges:
-                if neighbor not in visited:
-                    if dfs(neighbor, end, visited, path):
-                        return True
-            
-            path.pop()
-            return False
-        
-        path: List[Vertex] = []
-        dfs(self.vertices[start_label], self.vertices[end_label], set(), path)
-        if path:
-            path.append(self.vertices[end_label])
-        return path
+        self.finalize()
+        path = bidir_bfs(self._out_indptr, self._out_indices, self._in_indptr, self._in_indices,
+                         self.vertices[start_label].index, self.vertices[end_label].index)
+        return [self._order[vertex] for vertex in path]
+
+    def get_paths(self, pairs: List[Tuple[str, str]]) -> List[List[Vertex]]:
+        """
+        Get a shortest path for each (start, end) pair, running one Breadth First Search per distinct start vertex.
+
+        Args:
+            pairs (List[Tuple[str, str]]): The (start, end) labels of the paths to find.
+
+        Returns:
+            List[List[Vertex]]: The path for each pair, in the same order as pairs. A path is empty if end is unreachable.
+        """
+        self.finalize()
+        vertices, order = self.vertices, self._order
+        out_indptr, out_indices = self._out_indptr, self._out_indices
+        paths: List[List[Vertex]] = [[] for _ in pairs]
+
+        # Group the queries by start vertex so each BFS tree answers all of its targets.
+        queries: Dict[int, List[Tuple[int, int]]] = {}
+        for position, (start_label, end_label) in enumerate(pairs):
+            if start_label in vertices and end_label in vertices:
+                start = vertices[start_label].index
+                queries.setdefault(start, []).append((position, vertices[end_label].index))
+
+        for start, group in queries.items():
+            parents = bfs_parents(out_indptr, out_indices, start, {end for _, end in group})
+            for position, end in group:
+                if parents[end] == -2:
+                    continue
+
+                path = paths[position]
+                append = path.append
+                vertex = end
+                while vertex != -1:
+                    append(order[vertex])
+                    vertex = parents[vertex]
+                path.reverse()
+
+        return paths
     
     def get_all_reachable_vertices(self, start_label: str) -> Set[str]:
         """
-        Get all reachable vertices from the start vertex using DFS algorithm in a directed graph.
+        Get all reachable vertices from the start vertex using BFS algorithm in a directed graph.
 
         args:
             start_label (str): The label of the starting vertex.
@@ -183,104 +301,139 @@ class DirectedGraph:
         returns:
             Set[str]: A set of labels of vertices reachable from the start vertex.
         """
+        return set(self.iter_reachable(start_label))
+
+    def iter_reachable(self, start_label: str) -> Iterator[str]:
+        """
+        Lazily yield the labels of the vertices reachable from the start vertex in BFS order.
+
+        The traversal only advances as far as the caller consumes, so predicates such as
+        any(label == target for label in graph.iter_reachable(start)) stop early.
+
+        args:
+            start_label (str): The label of the starting vertex.
+
+        returns:
+            Iterator[str]: The labels of the reachable vertices, starting with start_label.
+        """
         if start_label not in self.vertices:
-            return set()
-        
-        def dfs(current: Vertex, visited: Set[Vertex], reachable: Set[str]) -> None:
-            visited.add(current)
-            reachable.add(current.label)
-            for edge in current.outgoing_edges:
-                neighbor = edge.end_vertex
-                if neighbor not in visited:
-                    dfs(neighbor, visited, reachable)
-        
-        start_vertex = self.vertices[start_label]
-        visited = set()
-        reachable = set()
-        dfs(start_vertex, visited, reachable)
-        return reachable
+            return
+
+        self.finalize()
+        order = self._order
+        for vertex in iter_bfs(self._out_indptr, self._out_indices, self.vertices[start_label].index):
+            yield order[vertex].label
     
     def count_min_additional_edges(self, start_label: str) -> int:
         """
         Calculate the minimum number of additional edges needed to make all airports reachable.
 
+        If start_label is not in the graph, every source SCC needs an edge, as in get_min_additional_edges.
+
         args:
             start_label (str): The label of the starting vertex.
 
         Returns:
             int: The minimum number of additional one-way routes.
         """
-        # Find all SCCs
-        sccs = self.get_strongly_connected_components()
+        return len(self._get_unreachable_sources(start_label))
+
+    def get_min_additional_edges(self, start_label: str) -> List[Tuple[str, str]]:
+        """
+        Get a minimum set of additional edges that makes all vertices reachable from the start vertex.
+
+        If start_label is not in the graph, it is treated as a new vertex with no edges, so one edge
+        is returned for every source SCC. This matches count_min_additional_edges.
+
+        args:
+            start_label (str): The label of the starting vertex.
+
+        Returns:
+            List[Tuple[str, str]]: The (start, end) labels of the additional edges.
+        """
+        # One edge from the start vertex into each unreachable source SCC reaches everything else.
+        return [(start_label, label) for label in self._get_unreachable_sources(start_label)]
+
+    def _get_unreachable_sources(self, start_label: str) -> List[str]:
+        """
+        Find the SCCs with no incoming edges in the condensed graph, apart from the start vertex's SCC.
+
+        args:
+            start_label (str): The label of the starting vertex.
 
-        # Build the condensed graph
-        condensed_graph = self.build_condensed_graph(sccs)
+        Returns:
+            List[str]: One representative vertex label for each unreachable source SCC.
+        """
+        component_ids, _ = self._get_components()
 
         # Find SCC of the start vertex
         start_component = -1
-        for i, component in enumerate(sccs):
-            if start_label in component:
-                start_component = i
-                break
+        if start_label in self.vertices:
+            start_component = component_ids[self.vertices[start_label].index]
+
+        # Collect nodes with in-degree = 0 (excluding the start SCC)
+        return [label for node, label in self._get_source_components() if node != start_component]
 
-        # Calculate in-degrees of the condensed graph nodes
-        in_degrees = {i: 0 for i in range(len(sccs))}
-        for node, neighbors in condensed_graph.items():
-            for neighbor in neighbors:
-                in_degrees[neighbor] += 1
+    def _get_components(self) -> Tuple[array, int]:
+        """
+        Get the SCC id of every vertex index, reusing the last result while the graph is unchanged.
+
+        Returns:
+            Tuple[array, int]: The component id of every vertex index, and the number of components.
+        """
+        self.finalize()
+        if self._components is None:
+            self._components = path_based_scc(self._out_indptr, self._out_indices)
+        return self._components
 
-        # Count nodes with in-degree = 0 (excluding the start SCC)
-        zero_in_degree_count = 0
-        for node in range(len(sccs)):
-            if in_degrees[node] == 0 and node != start_component:
-                zero_in_degree_count += 1
+    def _get_source_components(self) -> List[Tuple[int, str]]:
+        """
+        Get the SCCs with no incoming edges in the condensed graph, reusing the last result while the graph is unchanged.
 
-        return zero_in_degree_count
+        Returns:
+            List[Tuple[int, str]]: The id and a representative vertex label of each source SCC.
+        """
+        component_ids, component_count = self._get_components()
+        if self._source_components is None:
+            # Pick the first vertex added to the graph as the representative of each SCC
+            representatives = array('i', [-1]) * component_count
+            for vertex, component in enumerate(component_ids):
+                if representatives[component] == -1:
+                    representatives[component] = vertex
+
+            # Count the edges entering each SCC from other SCCs in a single pass over the CSR
+            in_degrees = component_in_degrees(self._out_indptr, self._out_indices, component_ids, component_count)
+            order = self._order
+            self._source_components = [
+                (node, order[representatives[node]].label)
+                for node in range(component_count)
+                if in_degrees[node] == 0
+            ]
+        return self._source_components
 
     def get_strongly_connected_components(self) -> List[Set[str]]:
         """
-        Get the strongly connected components of the graph using Tarjan's algorithm.
+        Get the strongly connected components of the graph using Gabow's path-based algorithm.
 
         Returns:
             List[Set[str]]: A list of strongly connected components.
         """
-        index = 0
-        stack: List[Vertex] = []
-        indices = {}
-        lowlinks = {}
-        on_stack = set()
-        components = []
-
-        def strongconnect(vertex: Vertex) -> None:
-            nonlocal index
-            indices[vertex] = index
-            lowlinks[vertex] = index
-            index += 1
-            stack.append(vertex)
-            on_stack.add(vertex)
-
-            for edge in vertex.outgoing_edges:
-                neighbor = edge.end_vertex
-                if neighbor not in indices:
-                    strongconnect(neighbor)
-                    lowlinks[vertex] = min(lowlinks[vertex], lowlinks[neighbor])
-                elif neighbor in on_stack:
-                    lowlinks[vertex] = min(lowlinks[vertex], indices[neighbor])
-
-            if lowlinks[vertex] == indices[vertex]:
-                component = set()
-                while True:
-                    w = stack.pop()
-                    on_stack.remove(w)
-                    component.add(w.label)
-                    if w == vertex:
-                        break
-                components.append(component)
-
-        for vertex in self.vertices.values():
-            if vertex not in indices:
-                strongconnect(vertex)
+        return self._group_components(*self._get_components())
+
+    def _group_components(self, component_ids: array, component_count: int) -> List[Set[str]]:
+        """
+        Group the vertex labels by component id.
 
+        args:
+            component_ids (array): The component id of every vertex index.
+            component_count (int): The number of components.
+
+        Returns:
+            List[Set[str]]: The labels of each component, indexed by component id.
+        """
+        components: List[Set[str]] = [set() for _ in range(component_count)]
+        for vertex, component in zip(self._order, component_ids):
+            components[component].add(vertex.label)
         return components
     
     def build_condensed_graph(self, sccs: List[Set[str]]) -> Dict[int, Set[int]]:
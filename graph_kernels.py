@@ -0,0 +1,271 @@
+from array import array
+from typing import Iterator, List, Set, Tuple
+
+
+def iter_bfs(indptr: array, indices: array, start: int) -> Iterator[int]:
+    """
+    Lazily yield every vertex reachable from start using Breadth First Search over a CSR adjacency.
+
+    Args:
+        indptr (array): The CSR row pointers, of length V + 1.
+        indices (array): The CSR successor indices.
+        start (int): The index of the starting vertex.
+
+    Returns:
+        Iterator[int]: The indices of the reachable vertices as they are dequeued, starting with start.
+    """
+    # Every vertex is enqueued at most once, so a queue of V slots never overflows.
+    size = len(indptr) - 1
+    visited = bytearray(size)
+    queue = array('i', [0]) * size
+    queue[0] = start
+    visited[start] = 1
+    head = 0
+    tail = 1
+    while head < tail:
+        current = queue[head]
+        head += 1
+        yield current
+        for neighbor in indices[indptr[current]:indptr[current + 1]]:
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                queue[tail] = neighbor
+                tail += 1
+
+
+def bidir_bfs(out_indptr: array, out_indices: array, in_indptr: array, in_indices: array,
+              source: int, target: int) -> List[int]:
+    """
+    Find a shortest path from source to target using bidirectional Breadth First Search.
+
+    The forward search follows the outgoing CSR and the backward search follows the incoming
+    CSR. The smaller frontier is expanded one level at a time until a newly discovered vertex
+    has already been seen by the other search.
+
+    Args:
+        out_indptr (array): The CSR row pointers of the successors.
+        out_indices (array): The CSR successor indices.
+        in_indptr (array): The CSR row pointers of the predecessors.
+        in_indices (array): The CSR predecessor indices.
+        source (int): The index of the starting vertex.
+        target (int): The index of the ending vertex.
+
+    Returns:
+        List[int]: The vertex indices along the path, or an empty list if target is unreachable.
+    """
+    if source == target:
+        return [source]
+
+    size = len(out_indptr) - 1
+    forward_parent = array('i', [-1]) * size
+    backward_parent = array('i', [-1]) * size
+    forward_visited = bytearray(size)
+    backward_visited = bytearray(size)
+    forward_visited[source] = 1
+    backward_visited[target] = 1
+    forward_frontier = [source]
+    backward_frontier = [target]
+    middle = -1
+
+    while forward_frontier and backward_frontier:
+        # Expand the smaller frontier by one level, stopping at the first vertex the other search has seen.
+        if len(forward_frontier) <= len(backward_frontier):
+            next_frontier = []
+            for vertex in forward_frontier:
+                for neighbor in out_indices[out_indptr[vertex]:out_indptr[vertex + 1]]:
+                    if not forward_visited[neighbor]:
+                        forward_visited[neighbor] = 1
+                        forward_parent[neighbor] = vertex
+                        if backward_visited[neighbor]:
+                            middle = neighbor
+                            break
+                        next_frontier.append(neighbor)
+                if middle != -1:
+                    break
+            forward_frontier = next_frontier
+        else:
+            next_frontier = []
+            for vertex in backward_frontier:
+                for neighbor in in_indices[in_indptr[vertex]:in_indptr[vertex + 1]]:
+                    if not backward_visited[neighbor]:
+                        backward_visited[neighbor] = 1
+                        backward_parent[neighbor] = vertex
+                        if forward_visited[neighbor]:
+                            middle = neighbor
+                            break
+                        next_frontier.append(neighbor)
+                if middle != -1:
+                    break
+            backward_frontier = next_frontier
+
+        if middle != -1:
+            break
+
+    if middle == -1:
+        return []
+
+    # Walk back to source along forward parents, then on to target along backward parents.
+    path: List[int] = []
+    vertex = middle
+    while vertex != -1:
+        path.append(vertex)
+        vertex = forward_parent[vertex]
+    path.reverse()
+
+    vertex = backward_parent[middle]
+    while vertex != -1:
+        path.append(vertex)
+        vertex = backward_parent[vertex]
+    return path
+
+
+def path_based_scc(indptr: array, indices: array) -> Tuple[array, int]:
+    """
+    Label the strongly connected components of a CSR graph using Gabow's path-based algorithm.
+
+    Each vertex only needs a preorder number. Vertices not yet assigned to a component stay on
+    the stack S, and the boundary stack B holds the preorder numbers where the current DFS path
+    may still split into separate components. Reaching back to an unassigned vertex pops B down
+    to it, which merges the path above it into one component.
+
+    Args:
+        indptr (array): The CSR row pointers, of length V + 1.
+        indices (array): The CSR successor indices.
+
+    Returns:
+        Tuple[array, int]: The component id of every vertex, and the number of components.
+            Components are numbered in the order they are completed.
+    """
+    size = len(indptr) - 1
+    preorder = array('i', [-1]) * size
+    component_ids = array('i', [-1]) * size
+    counter = 0
+    component_count = 0
+
+    # Preallocated S, B and DFS call stacks. Each vertex is pushed onto each at most once,
+    # and next_edge holds the position of the next successor to explore for every vertex.
+    stack = array('i', [0]) * size
+    stack_top = 0
+    boundaries = array('i', [0]) * size
+    boundaries_top = 0
+    call_stack = array('i', [0]) * size
+    next_edge = indptr[:-1]
+
+    for root in range(size):
+        if preorder[root] != -1:
+            continue
+
+        preorder[root] = counter
+        stack[stack_top] = root
+        stack_top += 1
+        boundaries[boundaries_top] = counter
+        boundaries_top += 1
+        counter += 1
+        call_stack[0] = root
+        call_top = 1
+
+        while call_top:
+            vertex = call_stack[call_top - 1]
+            position = next_edge[vertex]
+
+            if position < indptr[vertex + 1]:
+                next_edge[vertex] = position + 1
+                neighbor = indices[position]
+                if preorder[neighbor] == -1:
+                    preorder[neighbor] = counter
+                    stack[stack_top] = neighbor
+                    stack_top += 1
+                    boundaries[boundaries_top] = counter
+                    boundaries_top += 1
+                    counter += 1
+                    call_stack[call_top] = neighbor
+                    call_top += 1
+                elif component_ids[neighbor] == -1:
+                    # Collapse every boundary above the neighbour into its component.
+                    neighbor_preorder = preorder[neighbor]
+                    while boundaries[boundaries_top - 1] > neighbor_preorder:
+                        boundaries_top -= 1
+                continue
+
+            # All successors explored - returning from this vertex.
+            call_top -= 1
+            if boundaries[boundaries_top - 1] == preorder[vertex]:
+                boundaries_top -= 1
+                while True:
+                    stack_top -= 1
+                    w = stack[stack_top]
+                    component_ids[w] = component_count
+                    if w == vertex:
+                        break
+                component_count += 1
+
+    return component_ids, component_count
+
+
+def component_in_degrees(indptr: array, indices: array, component_ids: array, component_count: int) -> array:
+    """
+    Count the edges that enter each component from a different component.
+
+    Parallel edges between two components are each counted, so a component has a count of 0
+    exactly when it is a source of the condensed graph.
+
+    Args:
+        indptr (array): The CSR row pointers, of length V + 1.
+        indices (array): The CSR successor indices.
+        component_ids (array): The component id of every vertex.
+        component_count (int): The number of components.
+
+    Returns:
+        array: The number of incoming cross-component edges of every component.
+    """
+    in_degrees = array('i', [0]) * component_count
+    for vertex in range(len(indptr) - 1):
+        component = component_ids[vertex]
+        for neighbor in indices[indptr[vertex]:indptr[vertex + 1]]:
+            neighbor_component = component_ids[neighbor]
+            if neighbor_component != component:
+                in_degrees[neighbor_component] += 1
+    return in_degrees
+
+
+def bfs_parents(indptr: array, indices: array, source: int, targets: Set[int]) -> array:
+    """
+    Build a Breadth First Search tree from source, stopping once every target has been discovered.
+
+    Args:
+        indptr (array): The CSR row pointers, of length V + 1.
+        indices (array): The CSR successor indices.
+        source (int): The index of the starting vertex.
+        targets (Set[int]): The indices of the vertices whose paths are wanted.
+
+    Returns:
+        array: The BFS parent of every vertex. The source's parent is -1, and vertices that
+            were not reached have parent -2.
+    """
+    size = len(indptr) - 1
+    parents = array('i', [-2]) * size
+    parents[source] = -1
+
+    # Flag the targets still to be discovered so each discovery is a byte load, not a set lookup.
+    pending = bytearray(size)
+    for target in targets:
+        pending[target] = 1
+    remaining = len(targets) - pending[source]
+    pending[source] = 0
+
+    queue = array('i', [0]) * size
+    queue[0] = source
+    head = 0
+    tail = 1
+    while remaining and head < tail:
+        current = queue[head]
+        head += 1
+        for neighbor in indices[indptr[current]:indptr[current + 1]]:
+            if parents[neighbor] == -2:
+                parents[neighbor] = current
+                queue[tail] = neighbor
+                tail += 1
+                if pending[neighbor]:
+                    pending[neighbor] = 0
+                    remaining -= 1
+    return parents